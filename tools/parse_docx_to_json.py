@@ -2,110 +2,333 @@ import json
 import argparse
 import os
 import zipfile
-import shutil
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 
-from docx import Document
+from lxml import etree
 from docx.oxml.ns import qn
 
-# Global namespace map to avoid 'prefix a not found' errors
-NSMAP = {
-    "w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
-    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
-    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
-}
-
-
-def is_list_paragraph(p):
-    pPr = p._p.pPr
-    if pPr is None:
-        return False
-    return pPr.numPr is not None
-
-
-def get_list_level(p):
-    pPr = p._p.pPr
-    if pPr is None or pPr.numPr is None:
-        return 0
-    ilvl = pPr.numPr.ilvl
-    if ilvl is None:
-        return 0
-    try:
-        return int(ilvl.val)
-    except Exception:
-        return 0
-
-
-def extract_paragraph_with_images(paragraph, image_map):
+# Clark-notation tag/attribute names, built once instead of per element
+_W_BODY = qn("w:body")
+_W_TBL = qn("w:tbl")
+_W_TR = qn("w:tr")
+_W_TC = qn("w:tc")
+_W_TCPR = qn("w:tcPr")
+_W_GRIDSPAN = qn("w:gridSpan")
+_W_VMERGE = qn("w:vMerge")
+_W_P = qn("w:p")
+_W_PPR = qn("w:pPr")
+_W_NUMPR = qn("w:numPr")
+_W_ILVL = qn("w:ilvl")
+_W_R = qn("w:r")
+_W_DRAWING = qn("w:drawing")
+_W_T = qn("w:t")
+_W_TAB = qn("w:tab")
+_W_PTAB = qn("w:ptab")
+_W_BR = qn("w:br")
+_W_CR = qn("w:cr")
+_W_NOBREAKHYPHEN = qn("w:noBreakHyphen")
+_W_VAL = qn("w:val")
+_W_TYPE = qn("w:type")
+_A_BLIP = qn("a:blip")
+_R_EMBED = qn("r:embed")
+
+# Text-equivalent of the empty run-content elements
+_RUN_CHARS = {_W_TAB: "\t", _W_PTAB: "\t", _W_CR: "\n", _W_NOBREAKHYPHEN: "-"}
+
+COPY_BUFFER_SIZE = 1 << 20
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Zip-bomb guards for images extracted from a single .docx
+MAX_IMAGE_BYTES = 64 * 1024 * 1024
+MAX_TOTAL_IMAGE_BYTES = 512 * 1024 * 1024
+MAX_IMAGE_COMPRESSION_RATIO = 200
+# Below this size even a blank BMP/TIFF may legitimately exceed the ratio
+RATIO_CHECK_MIN_BYTES = 1024 * 1024
+
+DOCUMENT_XML_PATH = "word/document.xml"
+DOCUMENT_RELS_PATH = "word/_rels/document.xml.rels"
+RELATIONSHIP_TAG = (
+    "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+)
+
+
+@lru_cache(maxsize=32)
+def bullet_prefix(level):
+    """Tab indentation plus bullet for a list paragraph at this level."""
+    return "\t" * level + "• "
+
+
+def join_title_paragraphs(paragraphs):
     """
-    Extract text and inline images from a paragraph, returning a unified string.
-    - Text stays as-is
-    - Images become [[image:filename]]
+    Build a card title from a cell's (content, list_level) paragraphs.
+    No list formatting; we just join paragraph contents with spaces.
     """
-    runs_output = []
-
-    for run in paragraph.runs:
-        # Find all drawing elements (anchors/inline) in this run
-        drawings = run._element.findall(".//w:drawing", namespaces=NSMAP)
-
-        if drawings:
-            for drawing in drawings:
-                # Find the <a:blip> element that contains the r:embed ref
-                blip = drawing.find(".//a:blip", namespaces=NSMAP)
-                if blip is not None:
-                    rid = blip.get(qn("r:embed"))
-                    if rid in image_map:
-                        image_filename = image_map[rid]
-                        runs_output.append(f"[[image:{image_filename}]]")
-            # Skip normal text in this run if we already handled images
-            continue
-
-        # Add normal text (if any)
-        if run.text:
-            runs_output.append(run.text)
-
-    return "".join(runs_output).strip()
+    return " ".join(content for content, _ in paragraphs).strip()
 
 
-def extract_cell_text_preserve_lists_and_images(cell, image_map):
+def join_detail_paragraphs(paragraphs):
     """
-    Build a string from a table cell, preserving:
+    Build card details from a cell's (content, list_level) paragraphs, preserving:
     - bullet list indentation (\t)
     - inline image references ([[image:filename]])
     - normal text paragraphs
     """
     lines = []
-    for p in cell.paragraphs:
-        content = extract_paragraph_with_images(p, image_map)
-        if not content:
-            continue
-
-        if is_list_paragraph(p):
-            level = get_list_level(p)
-            indent = "\t" * level
-            lines.append(f"{indent}• {content}")
+    for content, level in paragraphs:
+        if level is not None:
+            lines.append(bullet_prefix(level) + content)
         else:
             lines.append(content)
 
     return "\n".join(lines)
 
 
-def extract_cell_title_with_images(cell, image_map):
+class CardTarget:
     """
-    Extract title text from a cell, including image markers.
-    No list formatting; we just join paragraph contents with spaces.
+    lxml parser target that turns the rows of one body-level table in
+    word/document.xml into cards straight from start/end/data events,
+    without building any element tree. Each card is handed to on_card as
+    soon as its row ends, so no card list is kept.
+
+    Elements are recognised by depth and parent, matching what python-docx
+    would read:
+      w:document(0) > w:body(1) > w:tbl(2) > w:tr(3) > w:tc(4) > w:p(5) > w:r(6) > w:t(7)
+    with w:tcPr/w:gridSpan|w:vMerge and w:pPr/w:numPr/w:ilvl hanging off w:tc
+    and w:p. A run holding a <w:drawing> contributes only its images, one
+    [[image:filename]] per drawing, and none of its text.
+    """
+
+    def __init__(self, image_map, on_card, table_index=0, has_header=True):
+        self.image_map = image_map
+        self.on_card = on_card
+        self.table_index = table_index
+        self.start_row = 1 if has_header else 0
+
+        self.card_count = 0
+        self.table_count = 0  # body-level tables seen so far
+        self.done = False     # target table fully read; the rest can be skipped
+
+        self._stack = []      # tags of the currently open elements
+        self._in_table = False
+        self._row_index = -1
+        self._in_row = False
+        self._cells = []      # (paragraphs, is_merge_continue) per grid column
+        self._above = ["", ""]  # last (title, detail) per column, for vertically merged cells
+        self._span = 1
+        self._merge_continue = False
+        self._paragraphs = []  # (content, list_level) of the current cell
+        self._parts = None     # text pieces of the current paragraph
+        self._level = None
+        self._in_run = False
+        self._run_start = 0      # index in _parts where the current run's output starts
+        self._run_images = None  # image markers of the current run, once it has a drawing
+        self._blip_pending = False
+        self._in_text = False
+
+    def doctype(self, name, pubid, system):
+        # OOXML parts never carry a DTD, and entity text would reach data()
+        # even with resolve_entities=False, so refuse it outright.
+        raise ValueError(f"{DOCUMENT_XML_PATH} must not contain a DOCTYPE declaration")
+
+    def start(self, tag, attrib):
+        stack = self._stack
+        depth = len(stack)
+        stack.append(tag)
+
+        if depth == 2:
+            if tag == _W_TBL and stack[1] == _W_BODY:
+                self._in_table = self.table_count == self.table_index
+                self.table_count += 1
+            return
+        if not self._in_table:
+            return
+        if depth == 3:
+            if tag == _W_TR:
+                self._row_index += 1
+                # Header rows are read too, as vertical merges can start there
+                self._in_row = True
+                self._cells = []
+            return
+        if not self._in_row:
+            return
+
+        if depth == 4:
+            if tag == _W_TC:
+                self._span = 1
+                self._merge_continue = False
+                self._paragraphs = []
+        elif depth == 5:
+            if tag == _W_P and stack[4] == _W_TC:
+                self._parts = []
+                self._level = None
+        elif self._parts is None:
+            # Cell properties: horizontal span and vertical merge
+            if depth == 6 and stack[5] == _W_TCPR:
+                if tag == _W_GRIDSPAN:
+                    try:
+                        self._span = int(attrib.get(_W_VAL))
+                    except (TypeError, ValueError):
+                        self._span = 1
+                elif tag == _W_VMERGE:
+                    self._merge_continue = attrib.get(_W_VAL, "continue") == "continue"
+        elif depth == 6:
+            if tag == _W_R:
+                self._in_run = True
+                self._run_start = len(self._parts)
+                self._run_images = None
+        elif self._in_run:
+            if depth == 7:
+                if tag == _W_T:
+                    self._in_text = True
+                elif tag == _W_BR:
+                    if attrib.get(_W_TYPE, "textWrapping") == "textWrapping":
+                        self._parts.append("\n")
+                elif tag in _RUN_CHARS:
+                    self._parts.append(_RUN_CHARS[tag])
+            if tag == _W_DRAWING:
+                if self._run_images is None:
+                    self._run_images = []
+                self._blip_pending = True
+            elif tag == _A_BLIP and self._blip_pending:
+                # Only the first <a:blip> of each drawing is an image
+                self._blip_pending = False
+                image_filename = self.image_map.get(attrib.get(_R_EMBED))
+                if image_filename and self._run_images is not None:
+                    self._run_images.append(f"[[image:{image_filename}]]")
+        elif depth == 7:
+            if tag == _W_NUMPR and stack[6] == _W_PPR:
+                self._level = 0
+        elif depth == 8:
+            if tag == _W_ILVL and stack[7] == _W_NUMPR and stack[6] == _W_PPR:
+                try:
+                    self._level = int(attrib.get(_W_VAL))
+                except Exception:
+                    self._level = 0
+
+    def data(self, data):
+        if self._in_text:
+            self._parts.append(data)
+
+    def end(self, tag):
+        stack = self._stack
+        stack.pop()
+        depth = len(stack)
+
+        if not self._in_row:
+            if depth == 2 and self._in_table:
+                self._in_table = False
+                self.done = True
+            return
+
+        if tag == _W_DRAWING:
+            # A drawing without a blip (e.g. SmartArt) must not leak into the next one
+            self._blip_pending = False
+
+        if depth == 7:
+            self._in_text = False
+        elif depth == 6:
+            if self._in_run and self._run_images is not None:
+                # Skip normal text in this run if it held images
+                self._parts[self._run_start:] = self._run_images
+            self._in_run = False
+            self._blip_pending = False
+        elif depth == 5:
+            if self._parts is not None:
+                content = "".join(self._parts).strip()
+                if content:
+                    self._paragraphs.append((content, self._level))
+                self._parts = None
+        elif depth == 4:
+            if tag == _W_TC:
+                # One entry per layout-grid column, like python-docx's Row.cells
+                cell = (self._paragraphs, self._merge_continue)
+                self._cells.extend([cell] * self._span)
+        elif depth == 3:
+            self._in_row = False
+            self._end_row()
+
+    def _end_row(self):
+        # Title may contain images now; details keep bullets + images.
+        # A vMerge continuation takes the value from the row above, so every
+        # row (header included) updates _above before deciding on a card.
+        for col, join in enumerate((join_title_paragraphs, join_detail_paragraphs)):
+            if col < len(self._cells):
+                paragraphs, merge_continue = self._cells[col]
+                if not merge_continue:
+                    self._above[col] = join(paragraphs)
+
+        if self._row_index < self.start_row or len(self._cells) < 2:
+            return
+
+        title, detail = self._above
+        if not title and not detail:
+            return
+
+        self.on_card({"title": title, "detail": detail})
+        self.card_count += 1
+
+    def close(self):
+        return self.card_count
+
+
+def read_image_relationships(z):
+    """
+    Map relId -> target_ref (e.g. 'media/image1.png') for the internal image
+    relationships of word/document.xml, streaming the .rels part so that
+    hyperlink/style/numbering relationships are never kept around.
     """
-    parts = []
-    for p in cell.paragraphs:
-        content = extract_paragraph_with_images(p, image_map)
-        if content:
-            parts.append(content)
-    return " ".join(parts).strip()
+    relid_to_target = {}
+    with z.open(DOCUMENT_RELS_PATH) as source:
+        for _, rel in etree.iterparse(
+            source, tag=RELATIONSHIP_TAG, resolve_entities=False
+        ):
+            if (rel.get("Type", "").endswith("/image")
+                    and rel.get("TargetMode") != "External"):
+                relid_to_target[rel.get("Id")] = rel.get("Target")
+            rel.clear()
+    return relid_to_target
+
+
+def copy_zip_member(z, info, dst_path, buf_view, limit):
+    """
+    Copy one zip member to dst_path through buf_view, never writing more
+    than limit bytes. dst is a normal buffered file, whose write() always
+    takes the whole chunk (chunks this large bypass its internal buffer).
+    A member whose data does not match its header (forged size, bad CRC,
+    broken deflate stream) fails to decompress rather than growing.
+    Returns (bytes_written, None), or (None, reason) after removing the
+    partial file if the member was corrupt or exceeded the limit.
+    """
+    copied = 0
+    try:
+        with z.open(info) as src, open(dst_path, "wb") as dst:
+            while True:
+                n = src.readinto(buf_view)
+                if not n:
+                    break
+                copied += n
+                if copied > limit:
+                    break
+                dst.write(buf_view[:n])
+    except (zipfile.BadZipFile, zlib.error) as e:
+        problem = f"corrupt data ({e})"
+    else:
+        if copied <= limit:
+            return copied, None
+        problem = f"more than {limit} bytes when decompressed"
+
+    if os.path.exists(dst_path):
+        os.remove(dst_path)
+    return None, problem
 
 
-def extract_images_from_docx(docx_path, output_folder, doc_basename):
+def extract_images_from_docx(z, output_folder, doc_basename, warn=print):
     """
-    Extract all images from a .docx file into output_folder.
+    Extract all images from an open .docx ZipFile into output_folder.
+    Skipped images are reported through warn (a callable taking one line).
 
     - Names follow: DOCFILENAME_Image00.ext
       e.g., 'Animal Care and Nursing_Image01.png'
@@ -113,100 +336,197 @@ def extract_images_from_docx(docx_path, output_folder, doc_basename):
         image_map: dict mapping relationship IDs (rId) -> final filename.
         image_files: sorted list of all image filenames created for this doc.
     """
-    doc = Document(docx_path)
-    rels = doc.part.rels
-
-    # Map relId -> target_ref (e.g. 'media/image1.png')
-    relid_to_target = {}
-    for rel in rels.values():
-        if "image" in rel.reltype:
-            relid_to_target[rel.rId] = rel.target_ref
-
     image_map = {}
     target_to_final = {}
     all_final_names = set()
     counter = 1  # per-document image numbering
 
-    with zipfile.ZipFile(docx_path, "r") as z:
-        for rid, target_ref in relid_to_target.items():
-            # Normalize the path into the zip
-            if target_ref.startswith("/"):
-                target_ref = target_ref[1:]
-            if not target_ref.startswith("word/"):
-                zip_path = "word/" + target_ref
-            else:
-                zip_path = target_ref
-
-            # If we've already extracted this underlying image file for this doc,
-            # just reuse the final name.
-            if zip_path in target_to_final:
-                final_name = target_to_final[zip_path]
-            else:
-                # Use the original extension, but standardized basename
-                _, orig_ext = os.path.splitext(zip_path)
-                if not orig_ext:
-                    orig_ext = ".bin"
-
-                final_name = f"{doc_basename}_Image{counter:02d}{orig_ext}"
-                counter += 1
+    total_bytes = 0  # decompressed image bytes written for this doc
 
-                try:
-                    with z.open(zip_path) as src, open(
-                        os.path.join(output_folder, final_name), "wb"
-                    ) as dst:
-                        shutil.copyfileobj(src, dst)
-                except KeyError:
-                    # If the image is somehow missing, skip it gracefully
+    # One copy buffer for every image in this doc
+    buf_view = memoryview(bytearray(COPY_BUFFER_SIZE))
+
+    for rid, target_ref in read_image_relationships(z).items():
+        # Normalize the path into the zip
+        if target_ref.startswith("/"):
+            target_ref = target_ref[1:]
+        if not target_ref.startswith("word/"):
+            zip_path = "word/" + target_ref
+        else:
+            zip_path = target_ref
+
+        # If we've already extracted this underlying image file for this doc,
+        # just reuse the final name.
+        if zip_path in target_to_final:
+            final_name = target_to_final[zip_path]
+        else:
+            # Use the original extension, but standardized basename
+            _, orig_ext = os.path.splitext(zip_path)
+            if not orig_ext:
+                orig_ext = ".bin"
+
+            final_name = f"{doc_basename}_Image{counter:02d}{orig_ext}"
+            counter += 1
+
+            try:
+                info = z.getinfo(zip_path)
+            except KeyError:
+                # If the image is somehow missing, skip it gracefully
+                info = None
+                final_name = None
+
+            if info is not None:
+                # Refuse zip-bomb style members before inflating anything
+                ratio = info.file_size / info.compress_size if info.compress_size else 0
+                limit = min(MAX_IMAGE_BYTES, MAX_TOTAL_IMAGE_BYTES - total_bytes)
+                if info.file_size > limit:
+                    copied, problem = None, (
+                        f"{info.file_size} bytes exceeds the {limit}-byte limit"
+                    )
+                elif (info.file_size > RATIO_CHECK_MIN_BYTES
+                        and ratio > MAX_IMAGE_COMPRESSION_RATIO):
+                    copied, problem = None, (
+                        f"compression ratio {ratio:.0f}:1 exceeds "
+                        f"{MAX_IMAGE_COMPRESSION_RATIO}:1"
+                    )
+                else:
+                    copied, problem = copy_zip_member(
+                        z, info, os.path.join(output_folder, final_name),
+                        buf_view, limit,
+                    )
+
+                if copied is None:
+                    warn(
+                        f"[WARN] Skipping image '{zip_path}' in "
+                        f"'{z.filename}': {problem}"
+                    )
                     final_name = None
+                else:
+                    total_bytes += copied
 
-                target_to_final[zip_path] = final_name
+            target_to_final[zip_path] = final_name
 
-            if final_name is not None:
-                image_map[rid] = final_name
-                all_final_names.add(final_name)
+        if final_name is not None:
+            image_map[rid] = final_name
+            all_final_names.add(final_name)
 
     return image_map, sorted(all_final_names)
 
 
-def parse_docx_table_with_images(path, image_output_folder, doc_basename,
-                                 table_index=0, has_header=True):
+def parse_docx_table_with_images(path, image_output_folder, doc_basename, on_card,
+                                 table_index=0, has_header=True, warn=print):
     """
-    Parse a .docx file into JSON with images extracted.
-    Returns (cards, image_files)
+    Parse a .docx file into cards with images extracted, passing each card
+    dict to on_card as it is parsed and any warnings to warn.
+    Returns (card_count, image_files)
     """
-    image_map, image_files = extract_images_from_docx(
-        docx_path=path,
-        output_folder=image_output_folder,
-        doc_basename=doc_basename,
-    )
-    doc = Document(path)
+    # One ZipFile (one central-directory read) for relationships, media and
+    # document.xml
+    with zipfile.ZipFile(path, "r") as z:
+        image_map, image_files = extract_images_from_docx(
+            z,
+            output_folder=image_output_folder,
+            doc_basename=doc_basename,
+            warn=warn,
+        )
+        target = CardTarget(
+            image_map, on_card, table_index=table_index, has_header=has_header
+        )
+        parser = etree.XMLParser(
+            target=target, huge_tree=True, resolve_entities=False
+        )
 
-    if table_index >= len(doc.tables):
+        with z.open(DOCUMENT_XML_PATH) as source:
+            while not target.done:
+                chunk = source.read(PARSE_CHUNK_SIZE)
+                if not chunk:
+                    parser.close()
+                    break
+                parser.feed(chunk)
+
+    if not target.done:
         raise IndexError(
-            f"'{path}' has only {len(doc.tables)} tables, "
+            f"'{path}' has only {target.table_count} tables, "
             f"but index={table_index} was requested."
         )
 
-    table = doc.tables[table_index]
-    cards = []
-    start_row = 1 if has_header else 0
+    return target.card_count, image_files
 
-    for row in table.rows[start_row:]:
-        cells = row.cells
-        if len(cells) < 2:
-            continue
 
-        # Title may contain images now
-        title = extract_cell_title_with_images(cells[0], image_map)
-        # Details with bullets + images
-        detail = extract_cell_text_preserve_lists_and_images(cells[1], image_map)
+class CardWriter:
+    """
+    Stream cards into a JSON array file one at a time, so a document's
+    cards never have to be held in memory together. Output matches
+    json.dump(cards, ...) in both compact and pretty (indent=2) form.
 
-        if not title and not detail:
-            continue
+    Cards go to a temporary file next to path, which always gets its closing
+    bracket on exit; it only replaces path if no exception occurred, so a
+    failed parse leaves the previous JSON in place.
+    """
 
-        cards.append({"title": title, "detail": detail})
+    def __init__(self, path, pretty=False):
+        self.path = path
+        self.pretty = pretty
+        self._tmp_path = path + ".tmp"
+        self._f = None
+        self._count = 0
+
+    def __enter__(self):
+        self._f = open(self._tmp_path, "w", encoding="utf-8", buffering=1 << 20)
+        self._f.write("[")
+        return self
+
+    def write(self, card):
+        if self.pretty:
+            text = json.dumps(card, ensure_ascii=False, indent=2)
+            self._f.write((",\n  " if self._count else "\n  ") + text.replace("\n", "\n  "))
+        else:
+            text = json.dumps(card, ensure_ascii=False, separators=(",", ":"))
+            self._f.write("," + text if self._count else text)
+        self._count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._f.write("\n]" if self.pretty and self._count else "]")
+        finally:
+            self._f.close()
+
+        if exc_type is None:
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+        return False
+
+
+def process_one(filename, docx_dir, json_dir, image_dir, table_index=0,
+                has_header=True, pretty=False):
+    """
+    Parse one .docx and write its JSON; meant to run in a worker process.
+    Returns (filename, card_count, image_files, warnings, error) where error
+    is None on success, so one bad file does not abort the whole batch.
+    Warnings are returned rather than printed so the caller can show them
+    under this file's header.
+    """
+    warnings = []
+    input_path = os.path.join(docx_dir, filename)
+    base, _ = os.path.splitext(filename)  # doc base name (with spaces)
+    output_json_path = os.path.join(json_dir, base + ".json")
+
+    try:
+        with CardWriter(output_json_path, pretty=pretty) as writer:
+            card_count, image_files = parse_docx_table_with_images(
+                path=input_path,
+                image_output_folder=image_dir,
+                doc_basename=base,
+                on_card=writer.write,
+                table_index=table_index,
+                has_header=has_header,
+                warn=warnings.append,
+            )
+    except Exception as e:
+        return filename, 0, [], warnings, str(e)
 
-    return cards, image_files
+    return filename, card_count, image_files, warnings, None
 
 
 # ---------- Manifest helpers ----------
@@ -231,11 +551,11 @@ def load_manifest(manifest_path):
     return data, index
 
 
-def save_manifest(manifest_path, manifest_data, index):
+def save_manifest(manifest_path, manifest_data, index, generated_at):
     """
-    Save manifest_data + index to manifest_path.
+    Save manifest_data + index to manifest_path, stamped with generated_at.
     """
-    manifest_data["generated_at"] = datetime.now(timezone.utc).isoformat()
+    manifest_data["generated_at"] = generated_at
     manifest_data["files"] = sorted(
         index.values(),
         key=lambda e: e.get("path", "")
@@ -291,8 +611,28 @@ def main():
         help="Directory where image files will be written (e.g. data/images)"
     )
 
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the flashcard JSON for reading (default: compact)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-parse every .docx, even if the manifest says it is unchanged"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Number of .docx files to parse in parallel (default: number of CPUs)"
+    )
+
     args = parser.parse_args()
 
+    # One timestamp for the whole run: every entry parsed now, and the manifest
+    run_ts = datetime.now(timezone.utc).isoformat()
+
     # Where to look for .docx files
     docx_dir = os.path.abspath(args.docx_dir)
 
@@ -318,51 +658,106 @@ def main():
     manifest_path = os.path.join(json_dir, "manifest.json")
     manifest_data, manifest_index = load_manifest(manifest_path)
 
-    docx_files = sorted(
-        f for f in os.listdir(docx_dir)
-        if f.lower().endswith(".docx") and not f.startswith("~$")
-    )
+    with os.scandir(docx_dir) as it:
+        docx_files = sorted(
+            e.name for e in it
+            if e.name.lower().endswith(".docx")
+            and not e.name.startswith("~$")
+            and e.is_file()
+        )
 
     if not docx_files:
         print(f"No .docx files found in {docx_dir}.")
         return
 
+    # Options that change the generated JSON; a file parsed with different
+    # ones is never treated as unchanged.
+    parse_options = {
+        "table_index": args.table_index,
+        "has_header": not args.no_header,
+        "pretty": args.pretty,
+    }
+
+    # Where images went, relative to the JSON (and manifest) so the
+    # committed manifest stays valid on any checkout.
+    image_dir_rel = os.path.relpath(image_dir, json_dir)
+
+    # Images the manifest attributes to each source .docx
+    images_by_source = {}
+    for entry in manifest_index.values():
+        if entry.get("type") == "image" and entry.get("source_docx"):
+            images_by_source.setdefault(entry["source_docx"], []).append(entry["path"])
+
+    # Skip files whose size/mtime, parse options and image dir still match
+    # what the manifest recorded the last time they were parsed, and whose
+    # JSON and images are all still on disk (unless --force).
+    source_stats = {}
+    changed_files = []
+    for filename in docx_files:
+        st = os.stat(os.path.join(docx_dir, filename))
+        source_stats[filename] = st
+        base, _ = os.path.splitext(filename)
+        json_entry = manifest_index.get(base + ".json", {})
+        unchanged = (
+            json_entry.get("src_mtime_ns") == st.st_mtime_ns
+            and json_entry.get("src_size") == st.st_size
+            and all(json_entry.get(k) == v for k, v in parse_options.items())
+            and json_entry.get("image_dir") == image_dir_rel
+            and os.path.exists(os.path.join(json_dir, base + ".json"))
+            and all(
+                os.path.exists(os.path.join(image_dir, img_name))
+                for img_name in images_by_source.get(filename, ())
+            )
+        )
+        if unchanged and not args.force:
+            print(f"Skipping {filename} (unchanged since last parse)")
+            continue
+        changed_files.append(filename)
+
     total_cards = 0
 
-    for filename in docx_files:
-        input_path = os.path.join(docx_dir, filename)
-        base, _ = os.path.splitext(filename)  # doc base name (with spaces)
-        output_json_name = base + ".json"
-        output_json_path = os.path.join(json_dir, output_json_name)
+    worker = partial(
+        process_one,
+        docx_dir=docx_dir,
+        json_dir=json_dir,
+        image_dir=image_dir,
+        **parse_options,
+    )
+    jobs = min(args.jobs or os.cpu_count() or 1, max(len(changed_files), 1))
+
+    # Each .docx is parsed independently; workers write their own JSON and
+    # only the manifest is updated here, in the original file order.
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(worker, changed_files))
+    else:
+        results = map(worker, changed_files)
 
+    for filename, card_count, image_files, warnings, error in results:
         print(f"\nProcessing {filename} ...")
-        try:
-            cards, image_files = parse_docx_table_with_images(
-                path=input_path,
-                image_output_folder=image_dir,
-                doc_basename=base,
-                table_index=args.table_index,
-                has_header=not args.no_header,
-            )
-        except Exception as e:
-            print(f"[ERROR] Failed to parse '{filename}': {e}")
+        for warning in warnings:
+            print(warning)
+        if error is not None:
+            print(f"[ERROR] Failed to parse '{filename}': {error}")
             continue
 
-        with open(output_json_path, "w", encoding="utf-8") as f:
-            json.dump(cards, f, ensure_ascii=False, indent=2)
-
-        print(f" → {len(cards)} cards → {output_json_path}")
-        total_cards += len(cards)
+        base, _ = os.path.splitext(filename)
+        output_json_name = base + ".json"
+        print(f" → {card_count} cards → {os.path.join(json_dir, output_json_name)}")
+        total_cards += card_count
 
         # --- Update manifest entries for this docx ---
-        parsed_at = datetime.now(timezone.utc).isoformat()
         source_docx = filename
 
         # JSON entry (path is just the filename; your client knows JSON lives in data/json)
         json_entry = manifest_index.get(output_json_name, {"path": output_json_name})
         json_entry["type"] = "json"
         json_entry["source_docx"] = source_docx
-        json_entry["parsed_at"] = parsed_at
+        json_entry["parsed_at"] = run_ts
+        json_entry["src_mtime_ns"] = source_stats[filename].st_mtime_ns
+        json_entry["src_size"] = source_stats[filename].st_size
+        json_entry.update(parse_options)
+        json_entry["image_dir"] = image_dir_rel
         manifest_index[output_json_name] = json_entry
 
         # Image entries (paths are filenames; client knows they live in data/images)
@@ -370,15 +765,18 @@ def main():
             img_entry = manifest_index.get(img_name, {"path": img_name})
             img_entry["type"] = "image"
             img_entry["source_docx"] = source_docx
-            img_entry["parsed_at"] = parsed_at
+            img_entry["parsed_at"] = run_ts
             manifest_index[img_name] = img_entry
 
-    save_manifest(manifest_path, manifest_data, manifest_index)
+    save_manifest(manifest_path, manifest_data, manifest_index, run_ts)
 
     print(
         f"\nDone. Exported a total of {total_cards} flashcards "
-        f"from {len(docx_files)} file(s) into JSON dir: {json_dir} and image dir: {image_dir}"
+        f"from {len(changed_files)} file(s) into JSON dir: {json_dir} and image dir: {image_dir}"
     )
+    skipped = len(docx_files) - len(changed_files)
+    if skipped:
+        print(f"Skipped {skipped} unchanged file(s); use --force to re-parse them.")
     print(f"Manifest updated at: {manifest_path}")
 
 